@@ -1,15 +1,47 @@
+import argparse
+import hashlib
+import heapq
 import json
 import os
 import re
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from urllib.request import Request, urlopen
+from itertools import islice
 
+import ahocorasick
 import feedparser
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
+from urllib3.util.retry import Retry
 
 OUT_PATH = "docs/data/latest_news.json"
+FEED_CACHE_PATH = "docs/data/.feed_cache.json"
+FEED_CACHE_DIR = "docs/data/.feed_cache"
 MAX_ITEMS = 20
 LOOKBACK_HOURS = 72
 TIMEOUT_SEC = 25
+MAX_WORKERS = 8
+
+# requests 외 경로(feedparser 내부 등)로 나가는 소켓도 무한 대기하지 않도록 기본 타임아웃 지정
+socket.setdefaulttimeout(TIMEOUT_SEC)
+
+# 같은 호스트(BoE 등)를 여러 번 호출하므로 keep-alive 세션 하나를 스레드들이 공유
+# gzip 응답은 requests(urllib3)가 받아서 투명하게 풀어줌 → HTML/JSON/RSS 전송량 감소
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (GitHub Actions bot)",
+    "Accept-Encoding": "gzip",
+}
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=MAX_WORKERS,
+    pool_maxsize=MAX_WORKERS,
+    # 연결 실패만 재시도(read=0): 읽기 타임아웃까지 재시도하면 소스당 대기 시간이 TIMEOUT_SEC의 몇 배로 늘어남
+    max_retries=Retry(total=2, read=0, backoff_factor=0.3),
+))
 
 SOURCES = {
     # ✅ Fed: 공식 RSS 안내 페이지 존재. :contentReference[oaicite:0]{index=0}
@@ -65,19 +97,152 @@ CATEGORY_RULES = {
     ],
 }
 
+# HTML 스크랩/정규화에 쓰는 패턴은 한 번만 컴파일
+_IMF_TITLE_RE = re.compile(r'IMF\s*/\s*[^<\n\r]{8,160}')
+_DATE_DMY_RE = re.compile(r'(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})')
+_DATE_DMBY_RE = re.compile(r'(\d{1,2}\s+[A-Za-z]+\s+\d{4})')
+
+# "15 January 2026" / "17 Oct 2025" 형태 날짜용 월 이름표(소문자 키)
+_MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+MONTHS = {
+    **{name.lower(): i for i, name in enumerate(_MONTH_NAMES, start=1)},
+    **{name[:3].lower(): i for i, name in enumerate(_MONTH_NAMES, start=1)},
+}
+
+def build_category_automaton() -> ahocorasick.Automaton:
+    # 모든 키워드를 하나의 Aho–Corasick 오토마톤으로 묶어 본문을 한 번만 스캔
+    words = {}
+    for cat, kws in CATEGORY_RULES.items():
+        for kw in kws:
+            words.setdefault(kw.lower(), set()).add(cat)
+    automaton = ahocorasick.Automaton()
+    for kw, cats in words.items():
+        automaton.add_word(kw, frozenset(cats))
+    automaton.make_automaton()
+    return automaton
+
+CATEGORY_AUTOMATON = build_category_automaton()
+
 def utc_now():
     return datetime.now(timezone.utc)
 
-def iso(dt: datetime):
-    return dt.astimezone(timezone.utc).replace(microsecond=0).isoformat()
+def http_get_response(url: str, headers: dict = HEADERS) -> requests.Response:
+    resp = SESSION.get(url, headers=headers, timeout=TIMEOUT_SEC)
+    resp.raise_for_status()
+    return resp
+
+def http_get_bytes(url: str) -> bytes:
+    return http_get_response(url).content
 
 def http_get(url: str) -> str:
-    req = Request(url, headers={"User-Agent": "Mozilla/5.0 (GitHub Actions bot)"})
-    with urlopen(req, timeout=TIMEOUT_SEC) as resp:
-        return resp.read().decode("utf-8", errors="replace")
+    return http_get_bytes(url).decode("utf-8", errors="replace")
+
+# url -> {etag, last_modified, body_path, content_type, final_url}
+# 파싱 결과(pickle) 대신 원문 바이트를 저장: actions/cache에서 복원한 파일을 실행하지 않고,
+# bozo_exception처럼 pickle이 안 되는 객체 때문에 캐시가 깨질 일도 없음
+_feed_cache = {}
+_feed_cache_lock = threading.Lock()
+
+def load_feed_cache():
+    try:
+        with open(FEED_CACHE_PATH, "r", encoding="utf-8") as f:
+            _feed_cache.update(json.load(f))
+    except Exception:
+        pass
+
+def save_feed_cache():
+    try:
+        with open(FEED_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(_feed_cache, f, ensure_ascii=False, indent=2)
+    except Exception:
+        pass
+
+def parse_iso(s: str) -> datetime | None:
+    s = str(s).strip().replace("Z", "+00:00")
+    try:
+        dt = datetime.fromisoformat(s)
+    except ValueError:
+        try:
+            dt = datetime.fromisoformat(s[:10])
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+def parse_day_month_year(s: str) -> datetime | None:
+    try:
+        d, mon, y = s.split()
+        return datetime(int(y), MONTHS[mon.lower()], int(d), tzinfo=timezone.utc)
+    except (ValueError, KeyError):
+        return None
+
+def parse_feed_body(content: bytes, headers, url: str):
+    # 디코딩은 feedparser에 맡김(XML prolog/Content-Type charset 인식),
+    # content-location으로 최종 URL을 넘겨 상대 <link>도 절대경로로 풀리게 함
+    response_headers = {k.lower(): v for k, v in headers.items()}
+    response_headers["content-location"] = url
+    return feedparser.parse(content, response_headers=response_headers)
+
+def parse_feed_response(resp: requests.Response):
+    return parse_feed_body(resp.content, resp.headers, resp.url)
+
+def fetch_and_parse(url: str):
+    # feedparser.parse(url)은 타임아웃이 없어 응답 없는 서버에서 멈출 수 있으므로, 직접 받아서 파싱만 맡김
+    # ETag/Last-Modified로 조건부 요청 → 304면 지난번에 저장해 둔 본문을 다시 받지 않고 재사용
+    with _feed_cache_lock:
+        cached = dict(_feed_cache.get(url) or {})
+
+    headers = dict(HEADERS)
+    body_path = cached.get("body_path")
+    if body_path and os.path.exists(body_path):
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    resp = http_get_response(url, headers)
+    if resp.status_code == 304 and body_path:
+        try:
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except Exception:
+            # 캐시가 깨졌으면 조건 없이 다시 받기
+            return parse_feed_response(http_get_response(url))
+        content_type = cached.get("content_type")
+        return parse_feed_body(body, {"content-type": content_type} if content_type else {}, cached.get("final_url") or url)
+
+    feed = parse_feed_response(resp)
+
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if etag or last_modified:
+        body_path = os.path.join(FEED_CACHE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".xml")
+        # 임시 파일에 다 쓴 뒤 교체 → 중간에 실패해도 이전 본문이 반쯤 덮어써지지 않음
+        tmp = body_path + ".tmp"
+        try:
+            os.makedirs(FEED_CACHE_DIR, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(resp.content)
+            os.replace(tmp, body_path)
+        except Exception:
+            return feed
+        with _feed_cache_lock:
+            _feed_cache[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "body_path": body_path,
+                "content_type": resp.headers.get("Content-Type"),
+                "final_url": resp.url,
+            }
+    return feed
 
 def norm_space(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+    # 인자 없는 split()이 유니코드 공백 전체를 기준으로 나누므로 정규식 없이 같은 결과
+    return " ".join(s.split()) if s else ""
 
 def parse_feed_time(entry) -> datetime | None:
     t = getattr(entry, "published_parsed", None) or getattr(entry, "updated_parsed", None)
@@ -87,204 +252,227 @@ def parse_feed_time(entry) -> datetime | None:
 
 def categorize(title: str, source: str) -> list[str]:
     text = (title or "") + " " + (source or "")
-    text_low = text.lower()
-    cats = []
-    for cat, kws in CATEGORY_RULES.items():
-        if any(kw.lower() in text_low for kw in kws):
-            cats.append(cat)
+    found = set()
+    for _, hit_cats in CATEGORY_AUTOMATON.iter(text.lower()):
+        found.update(hit_cats)
+    # CATEGORY_RULES 순서 유지
+    cats = [cat for cat in CATEGORY_RULES if cat in found]
     return cats or ["other"]
 
-def add_item(items: list, title: str, source: str, link: str, published_dt: datetime | None):
-    title = norm_space(title)
-    source = norm_space(source)
+def add_item(items: list, seen_links: set, cutoff: datetime, title: str, source: str, link: str, published_dt: datetime | None):
+    # 조회 기간 밖의 항목은 정규화/분류 전에 바로 버림(시간 없는 항목은 유지)
+    if published_dt and published_dt < cutoff:
+        return
     link = (link or "").strip()
-    if not title or not link:
+    if not link or not (title or "").strip():
+        return
+    # 같은 소스 안의 링크 중복은 정규화/분류 전에 바로 버림(소스 간 중복은 main에서 제출 순서대로 처리)
+    if link in seen_links:
         return
+    seen_links.add(link)
+
+    title = norm_space(title)
+    source = norm_space(source)
+    if published_dt:
+        published_dt = published_dt.astimezone(timezone.utc)
 
     items.append({
         "title": title,
         "source": source if source else "Unknown",
         "link": link,
-        "published_utc": iso(published_dt) if published_dt else None,
+        # datetime 그대로 보관 → 필터/정렬에 바로 쓰고, 출력 시 orjson이 ISO 문자열로 변환
+        "published_utc": published_dt,
         "categories": categorize(title, source),
     })
 
-def collect_rss(items: list, url: str, source_name: str, limit: int = 50):
-    feed = feedparser.parse(url)
-    for e in feed.entries[:limit]:
-        add_item(items, e.get("title", ""), source_name, e.get("link", ""), parse_feed_time(e))
+def pick_link_anchors(tree, selector: str, base: str) -> dict:
+    # 링크별로 대표 <a> 하나만 고름: 카드마다 이미지 전용 <a>가 텍스트 <a>보다 먼저 나오는 경우가 있어
+    # 같은 href면 텍스트가 있는 쪽을 우선(순서는 처음 등장한 위치 유지)
+    anchors = {}
+    for a in tree.css(selector):
+        link = a.attributes.get("href") or ""
+        if link.startswith("/"):
+            link = base + link
+        if not link:
+            continue
+        title = a.text(separator=" ", strip=True)
+        if link not in anchors or (title and not anchors[link][1]):
+            anchors[link] = (a, title)
+    return anchors
+
+def search_nearby(node, pattern: re.Pattern, selector: str, depth: int = 3):
+    # 링크를 감싼 부모 블록을 몇 단계만 올라가며 그 서브트리 텍스트에서만 패턴 검색
+    # 다른 링크까지 품은 블록(목록 전체 등)에 닿으면 멈춤 → 옆 카드의 날짜를 가져오지 않음
+    href = node.attributes.get("href")
+    for _ in range(depth):
+        node = node.parent
+        if node is None:
+            break
+        if any(a.attributes.get("href") != href for a in node.css(selector)):
+            break
+        # 텍스트 노드 사이를 줄바꿈으로 이어 "IMF / ..." 제목 패턴이 노드 경계에서 끊기게 함
+        m = pattern.search(node.text(separator="\n"))
+        if m:
+            return m
+    return None
+
+def collect_rss(cutoff: datetime, url: str, source_name: str, limit: int = 50) -> list[dict]:
+    items = []
+    seen_links = set()
+    try:
+        feed = fetch_and_parse(url)
+        for e in feed.entries[:limit]:
+            add_item(items, seen_links, cutoff, e.get("title", ""), source_name, e.get("link", ""), parse_feed_time(e))
+    except Exception:
+        pass
+    return items
 
-def collect_imf(items: list):
+def collect_imf(cutoff: datetime) -> list[dict]:
     # IMF Media Center는 RSS가 아니라 listing HTML 기반. :contentReference[oaicite:6]{index=6}
+    items = []
+    seen_links = set()
     try:
-        html = http_get(SOURCES["IMF_NEWSLISTING"])
-
-        # date 패턴(예: 17 Oct 2025) / 링크(/news/...)를 함께 잡기
-        # 링크는 보통 /news/xxxxx 형태
-        links = re.findall(r'href="([^"]+/news/[^"]+)"', html)
-        # 제목 후보는 "IMF / ..." 텍스트를 우선 시도
-        # 날짜는 "dd Mon yyyy" 패턴 우선
-        date_re = re.compile(r'(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})')
-        seen = set()
-
-        for href in links:
-            link = href
-            if link.startswith("/"):
-                link = "https://mediacenter.imf.org" + link
-            if link in seen:
-                continue
-            seen.add(link)
-
-            idx = html.find(href)
-            window = html[max(0, idx - 500): idx + 500]
+        tree = LexborHTMLParser(http_get(SOURCES["IMF_NEWSLISTING"]))
 
-            m_title = re.search(r'IMF\s*/\s*[^<\n\r]{8,160}', window)
-            title = m_title.group(0) if m_title else "IMF update"
+        # 링크는 보통 /news/xxxxx 형태, 제목은 링크 텍스트
+        # 날짜는 링크를 감싼 작은 블록 안의 "dd Mon yyyy" 패턴(예: 17 Oct 2025)
+        selector = 'a[href*="/news/"]'
+        anchors = pick_link_anchors(tree, selector, "https://mediacenter.imf.org")
+        for link, (a, title) in islice(anchors.items(), 20):
+            if not title:
+                m_title = search_nearby(a, _IMF_TITLE_RE, selector)
+                title = m_title.group(0) if m_title else "IMF update"
 
-            m_date = date_re.search(window)
-            published_dt = None
-            if m_date:
-                try:
-                    published_dt = datetime.strptime(m_date.group(1), "%d %b %Y").replace(tzinfo=timezone.utc)
-                except Exception:
-                    published_dt = None
+            m_date = search_nearby(a, _DATE_DMY_RE, selector)
+            published_dt = parse_day_month_year(m_date.group(1)) if m_date else None
 
-            add_item(items, title, "IMF", link, published_dt)
-
-            if len(seen) >= 20:
-                break
+            add_item(items, seen_links, cutoff, title, "IMF", link, published_dt)
     except Exception:
         pass
+    return items
 
-def collect_world_bank(items: list):
+def collect_world_bank(cutoff: datetime) -> list[dict]:
     # World Bank News 페이지에 press release용 search API endpoint가 노출됩니다. :contentReference[oaicite:7]{index=7}
+    items = []
+    seen_links = set()
     try:
-        raw = http_get(SOURCES["WORLD_BANK_PRESS_API"])
-        data = json.loads(raw)
+        # json.loads는 bytes를 직접 받으므로 문자열 디코딩 단계를 생략
+        data = json.loads(http_get_bytes(SOURCES["WORLD_BANK_PRESS_API"]))
         docs = data.get("documents") or {}
-        for _, d in list(docs.items())[:60]:
+        for d in islice(docs.values(), 60):
             title = d.get("title") or ""
             link = d.get("url") or d.get("link") or ""
             # date는 문자열로 오는 경우가 많아서 파싱 시도
-            published_dt = None
             dt_str = d.get("date") or d.get("pub_date") or d.get("updated") or d.get("docdt")
-            if dt_str:
-                # 다양한 형식을 안전하게 커버(YYYY-MM-DD, ISO 등)
-                for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S%z"):
-                    try:
-                        published_dt = datetime.strptime(str(dt_str)[:len(fmt)], fmt)
-                        if published_dt.tzinfo is None:
-                            published_dt = published_dt.replace(tzinfo=timezone.utc)
-                        else:
-                            published_dt = published_dt.astimezone(timezone.utc)
-                        break
-                    except Exception:
-                        continue
-            add_item(items, title, "World Bank", link, published_dt)
+            # YYYY-MM-DD, ISO(+Z/오프셋) 모두 fromisoformat으로 처리, 안 되면 날짜 부분만 사용
+            published_dt = parse_iso(dt_str) if dt_str else None
+            add_item(items, seen_links, cutoff, title, "World Bank", link, published_dt)
     except Exception:
         pass
+    return items
 
-def collect_oecd(items: list):
+def collect_oecd(cutoff: datetime) -> list[dict]:
     # OECD “Latest news releases” 섹션이 있는 공식 페이지에서 HTML로 제목/날짜/링크 스크랩. :contentReference[oaicite:8]{index=8}
+    items = []
+    seen_links = set()
     try:
         html = http_get(SOURCES["OECD_STATS_RELEASES_PAGE"])
 
-        # "Latest news releases" 이후의 링크들만 대충 추출
+        # "Latest news releases" 이후 부분만 파싱
         anchor_start = html.lower().find("latest news releases")
         if anchor_start == -1:
             anchor_start = 0
-        snippet = html[anchor_start: anchor_start + 120000]
+        tree = LexborHTMLParser(html[anchor_start: anchor_start + 120000])
 
         # /en/.../statistical-releases/... 링크를 우선적으로 뽑기
-        links = re.findall(r'href="([^"]+/en/data/insights/statistical-releases/[^"]+)"', snippet)
-        seen = set()
-        for href in links:
-            link = href
-            if link.startswith("/"):
-                link = "https://www.oecd.org" + link
-            if link in seen:
-                continue
-            seen.add(link)
-
-            # 링크 주변에서 날짜 패턴 찾기(예: 15 January 2026)
-            idx = snippet.find(href)
-            win = snippet[max(0, idx - 400): idx + 500]
-
-            # 제목은 링크 텍스트가 HTML에 섞여 있어서, 근처의 title-ish 텍스트를 대충 잡음
-            # 가장 안전하게는 href 마지막 슬러그를 제목 후보로 쓰되, 사람이 보기 좋게 처리
-            slug = link.rstrip("/").split("/")[-1]
-            title_guess = slug.replace("-", " ").strip()
-            title_guess = title_guess[:120] if title_guess else "OECD statistical release"
-
-            m_date = re.search(r'(\d{1,2}\s+[A-Za-z]+\s+\d{4})', win)
-            published_dt = None
-            if m_date:
-                try:
-                    published_dt = datetime.strptime(m_date.group(1), "%d %B %Y").replace(tzinfo=timezone.utc)
-                except Exception:
-                    published_dt = None
-
-            add_item(items, title_guess, "OECD", link, published_dt)
-
-            if len(seen) >= 15:
-                break
+        selector = 'a[href*="/en/data/insights/statistical-releases/"]'
+        anchors = pick_link_anchors(tree, selector, "https://www.oecd.org")
+        for link, (a, title) in islice(anchors.items(), 15):
+            # 제목은 링크 텍스트, 없으면 href 마지막 슬러그를 사람이 보기 좋게 처리
+            if not title:
+                slug = link.rstrip("/").split("/")[-1]
+                title = slug.replace("-", " ").strip()[:120] or "OECD statistical release"
+
+            # 링크 주변 블록에서 날짜 패턴 찾기(예: 15 January 2026)
+            m_date = search_nearby(a, _DATE_DMBY_RE, selector)
+            published_dt = parse_day_month_year(m_date.group(1)) if m_date else None
+
+            add_item(items, seen_links, cutoff, title, "OECD", link, published_dt)
     except Exception:
         pass
+    return items
 
-def main():
-    os.makedirs(os.path.dirname(OUT_PATH), exist_ok=True)
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="기관 경제 뉴스 수집 → " + OUT_PATH)
+    parser.add_argument("--max-items", type=int, default=MAX_ITEMS)
+    parser.add_argument("--lookback-hours", type=int, default=LOOKBACK_HOURS)
+    return parser.parse_args(argv)
 
+def main(argv=None):
+    args = parse_args(argv)
+    os.makedirs(os.path.dirname(OUT_PATH), exist_ok=True)
+    load_feed_cache()
+
+    # 최근 N시간만 남기기: add_item에서 기간 밖 항목을 미리 걸러냄
+    cutoff = utc_now() - timedelta(hours=args.lookback_hours)
+    jobs = [
+        # ✅ 필수 기관
+        (collect_imf, ()),
+        (collect_world_bank, ()),
+        (collect_rss, (SOURCES["FED_PRESS_RSS"], "Federal Reserve", 50)),
+
+        # ✅ 출처 확장(추가 3개)
+        (collect_rss, (SOURCES["BIS_PRESS_RSS"], "BIS", 50)),
+        (collect_rss, (SOURCES["BOE_NEWS_RSS"], "Bank of England", 50)),
+        (collect_rss, (SOURCES["BOE_PUBLICATIONS_RSS"], "Bank of England", 50)),
+        (collect_rss, (SOURCES["BOE_SPEECHES_RSS"], "Bank of England", 50)),
+        (collect_oecd, ()),
+    ]
+
+    # 네트워크 I/O 위주라 스레드로 동시에 받아오고, 결과는 제출 순서대로 합침
+    # → 여러 소스에 같은 링크가 있으면 항상 jobs 앞쪽 소스(IMF > World Bank > Fed > ...)가 남음
     items = []
-
-    # ✅ 필수 기관
-    collect_imf(items)
-    collect_world_bank(items)
-    collect_rss(items, SOURCES["FED_PRESS_RSS"], "Federal Reserve", limit=50)
-
-    # ✅ 출처 확장(추가 3개)
-    collect_rss(items, SOURCES["BIS_PRESS_RSS"], "BIS", limit=50)
-    collect_rss(items, SOURCES["BOE_NEWS_RSS"], "Bank of England", limit=50)
-    collect_rss(items, SOURCES["BOE_PUBLICATIONS_RSS"], "Bank of England", limit=50)
-    collect_rss(items, SOURCES["BOE_SPEECHES_RSS"], "Bank of England", limit=50)
-    collect_oecd(items)
-
-    # 1) 링크 기준 중복 제거
-    dedup = []
     seen_links = set()
-    for it in items:
-        if it["link"] in seen_links:
-            continue
-        seen_links.add(it["link"])
-        dedup.append(it)
-
-    # 2) 최근 24시간만 남기기(시간 없는 항목은 뒤로 보내되 일단 유지)
-    cutoff = utc_now() - timedelta(hours=LOOKBACK_HOURS)
-
-    recent = []
-    unknown_time = []
-    for it in dedup:
-        if it["published_utc"]:
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        futures = [ex.submit(fn, cutoff, *args) for fn, args in jobs]
+        for f in futures:
             try:
-                dt = datetime.fromisoformat(it["published_utc"].replace("Z", "+00:00")).astimezone(timezone.utc)
-                if dt >= cutoff:
-                    recent.append((dt, it))
+                result = f.result()
             except Exception:
-                unknown_time.append(it)
+                continue
+            for it in result:
+                if it["link"] in seen_links:
+                    continue
+                seen_links.add(it["link"])
+                items.append(it)
+    save_feed_cache()
+
+    # 1) 링크 기준 중복 제거는 위에서, 2) 기간 필터는 add_item에서 이미 처리됨
+    # (시간 없는 항목은 뒤로 보내되 일단 유지)
+    recent = []
+    unknown_time = []
+    for it in items:
+        dt = it["published_utc"]
+        if dt:
+            recent.append((dt, it))
         else:
             unknown_time.append(it)
 
-    recent.sort(key=lambda x: x[0], reverse=True)
-    sorted_items = [it for _, it in recent]
+    # 3) 최대 N개(기본 20): 전체 정렬 대신 최신 N개만 힙으로 뽑고, 남는 자리는 시간 없는 항목으로 채움
+    top = heapq.nlargest(args.max_items, recent, key=lambda x: x[0])
+    sorted_items = [it for _, it in top] + unknown_time[:max(0, args.max_items - len(top))]
 
-    # 3) 최대 20개
     out = {
-        "generated_at_utc": iso(utc_now()),
-        "lookback_hours": LOOKBACK_HOURS,
-        "items": sorted_items[:MAX_ITEMS],
+        "generated_at_utc": utc_now(),
+        "lookback_hours": args.lookback_hours,
+        "items": sorted_items,
     }
 
-    with open(OUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=2)
+    # 임시 파일에 다 쓴 뒤 교체 → 중간에 죽어도 페이지가 잘린 JSON을 읽지 않음
+    tmp = OUT_PATH + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(out, option=orjson.OPT_INDENT_2 | orjson.OPT_OMIT_MICROSECONDS))
+    os.replace(tmp, OUT_PATH)
 
 if __name__ == "__main__":
     main()